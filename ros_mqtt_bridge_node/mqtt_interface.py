@@ -7,6 +7,13 @@ from datetime import datetime
 from typing import Dict, Any, Callable, Optional, Union, List
 import logging
 
+try:
+    # orjson为C实现的JSON编码器，直接输出UTF-8字节
+    import orjson
+except ImportError:
+    # 未安装orjson时回退到标准库json
+    orjson = None
+
 
 class MQTTInterface:
     """通用MQTT接口类，提供MQTT连接、发布、订阅等基础功能"""
@@ -151,12 +158,12 @@ class MQTTInterface:
         
         try:
             # 处理不同类型的payload
-            if isinstance(payload, bytes):
+            if isinstance(payload, (bytes, bytearray)):
                 # 直接发送二进制数据
                 final_payload = payload
             elif isinstance(payload, (dict, list)):
-                # 如果payload是字典或列表，转换为JSON字符串
-                final_payload = json.dumps(payload, ensure_ascii=False, default=self._json_serializer)
+                # 如果payload是字典或列表，序列化为JSON
+                final_payload = self.serialize(payload)
             else:
                 # 其他类型转换为字符串
                 final_payload = str(payload)
@@ -174,6 +181,20 @@ class MQTTInterface:
             self.logger.error(f"发布消息时发生错误: {str(e)}")
             return False
     
+    def serialize(self, payload: Any) -> bytes:
+        """
+        将消息序列化为UTF-8编码的JSON字节
+        
+        Args:
+            payload: 待序列化的对象
+            
+        Returns:
+            bytes: JSON字节串
+        """
+        if orjson is not None:
+            return orjson.dumps(payload, default=self._json_serializer)
+        return json.dumps(payload, ensure_ascii=False, default=self._json_serializer).encode('utf-8')
+    
     def _json_serializer(self, obj):
         """自定义JSON序列化器，处理特殊数据类型"""
         import numpy as np
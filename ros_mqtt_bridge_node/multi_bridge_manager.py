@@ -2,13 +2,14 @@
 
 import rclpy
 from rclpy.node import Node
+from rclpy.executors import MultiThreadedExecutor
 import json
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from .mqtt_interface import MQTTInterface, MQTTMessageBuilder
 from .config_loader import BridgeConfigLoader, get_default_config_path
-from .topic_bridge import TopicBridge
+from .topic_bridge import TopicBridge, MISSING_ACCELERATORS
 
 
 class MultiBridgeManager(Node):
@@ -57,6 +58,12 @@ class MultiBridgeManager(Node):
             # 声明ROS参数（可覆盖配置文件设置）
             self._declare_parameters()
             
+            # 可选加速依赖缺失时提示一次（功能不受影响，但编码性能回退到标准库）
+            if MISSING_ACCELERATORS:
+                self.get_logger().warning(
+                    f'未安装可选加速依赖: {", ".join(MISSING_ACCELERATORS)}，已回退到标准库实现'
+                    f'（pip install ros_mqtt_bridge_node[fast] 或 pip install {" ".join(MISSING_ACCELERATORS)}）')
+            
             # 初始化MQTT接口
             if not self._initialize_mqtt():
                 return False
@@ -469,9 +476,7 @@ class MultiBridgeManager(Node):
             self.start_time = datetime.now()
             
             for bridge in self.bridges.values():
-                bridge.message_count = 0
-                bridge.start_time = datetime.now()
-                bridge.last_message_time = None
+                bridge.reset_statistics()
             
             self.get_logger().info('📊 统计信息已重置')
             self._publish_manager_status('statistics_reset')
@@ -544,19 +549,24 @@ def main(args=None):
     if len(sys.argv) > 1:
         config_file_path = sys.argv[1]
     
+    # 多线程执行器：各桥接器使用独立回调组，可并行处理消息
+    executor = MultiThreadedExecutor()
+    
     try:
         # 创建节点
         manager = MultiBridgeManager(config_file_path)
         
         # 运行节点
-        rclpy.spin(manager)
+        executor.add_node(manager)
+        executor.spin()
         
     except KeyboardInterrupt:
         manager.get_logger().info('收到键盘中断信号')
     except Exception as e:
         print(f'节点运行时发生错误: {str(e)}')
     finally:
-        # 清理资源
+        # 清理资源：先关闭执行器，等待工作线程退出桥接器回调后再销毁节点
+        executor.shutdown()
         if 'manager' in locals():
             manager.destroy_node()
         rclpy.shutdown()
@@ -4,18 +4,203 @@ import rclpy
 from rclpy.node import Node
 from rclpy.subscription import Subscription
 from rclpy.publisher import Publisher
+from rclpy.qos import QoSProfile, ReliabilityPolicy, HistoryPolicy
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
 import importlib
+import functools
 import json
-import base64
+import operator
+import queue
+import sys
+import time
 import numpy as np
 from typing import Dict, Any, Optional, Callable
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 未安装的可选加速依赖（回退到标准库实现），由管理器启动时统一提示
+MISSING_ACCELERATORS = []
+
+try:
+    # pybase64 使用SIMD加速Base64编码，大幅降低图像数据的编码开销
+    from pybase64 import b64encode, b64encode_as_string
+except ImportError:
+    # 未安装pybase64时回退到标准库
+    from base64 import b64encode
+    MISSING_ACCELERATORS.append('pybase64')
+
+    def b64encode_as_string(data) -> str:
+        return b64encode(data).decode('latin-1')
+
+try:
+    # orjson可直接解析bytes，省去中间的str解码
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+    MISSING_ACCELERATORS.append('orjson')
+
+try:
+    # msgpack为可选的二进制编码格式，数值类消息体积更小
+    import msgpack
+except ImportError:
+    msgpack = None
+    MISSING_ACCELERATORS.append('msgpack')
+
+# 图像消息类型（frozenset保证O(1)成员判断）
+IMAGE_TYPES = frozenset({'sensor_msgs/Image', 'sensor_msgs/CompressedImage'})
+
+# JSON文本可能的首字节（对象、数组、字符串、true/false/null、数字）
+_JSON_START_BYTES = b'{["tfn-0123456789'
+# 可打印ASCII及空白字符：msgpack桥接器的auto模式下，以此开头的负载按纯文本处理
+# （msgpack消息体为map/array，首字节不在此范围内）
+_TEXT_START_BYTES = frozenset(range(0x20, 0x7f)) | frozenset(b'\t\n\r')
+
+# 图像Data URL前缀
+_DATA_URL_PREFIX_JPEG = b'data:image/jpeg;base64,'
+_DATA_URL_PREFIX_PNG = b'data:image/png;base64,'
+
+# 可直接输出的ROS基本字段类型
+_SCALAR_FIELD_TYPES = frozenset({
+    'boolean', 'float', 'double', 'string', 'wstring',
+    'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64'
+})
+# 数组元素类型：单字节元素按二进制编码，多字节数值输出为JSON数组
+_BYTE_ELEMENT_TYPES = frozenset({'int8', 'uint8'})
+_NUMERIC_ELEMENT_TYPES = frozenset({
+    'float', 'double', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64'
+})
+
+
+def _as_byte_view(data) -> memoryview:
+    """获取数组的字节视图（零拷贝），非连续的numpy数组先转换为连续数组"""
+    if isinstance(data, np.ndarray) and not data.flags['C_CONTIGUOUS']:
+        data = np.ascontiguousarray(data)
+    return memoryview(data).cast('B')
+
+
+def _to_data_url(prefix: bytes, byte_data) -> str:
+    """编码为Base64并在bytearray中原地拼接前缀"""
+    buf = bytearray(prefix)
+    buf += b64encode(byte_data)
+    # Base64为纯ASCII，latin-1解码是直接的字节拷贝，省去UTF-8校验
+    return buf.decode('latin-1')
+
+
+@functools.lru_cache(maxsize=None)
+def _message_field_names(message_class) -> tuple:
+    """消息类型的字段名（按类型缓存）"""
+    return tuple(message_class.get_fields_and_field_types())
+
+
+def _convert_field_value(value) -> Any:
+    """转换单个字段值：字节数组编码为Base64，数值数组转为列表，嵌套消息递归转换"""
+    if isinstance(value, bytes):
+        return b64encode_as_string(value)
+    if isinstance(value, (np.ndarray, array.array)):
+        if value.itemsize == 1:
+            return b64encode_as_string(_as_byte_view(value))
+        return value.tolist()
+    if hasattr(value, 'get_fields_and_field_types'):
+        return _message_to_dict(value)
+    if isinstance(value, (list, tuple)):
+        return [_convert_field_value(item) for item in value]
+    return value
+
+
+def _message_to_dict(msg) -> Dict[str, Any]:
+    """将ROS2消息一次遍历转换为字典，二进制字段直接编码为Base64"""
+    return {
+        field_name: _convert_field_value(getattr(msg, field_name))
+        for field_name in _message_field_names(type(msg))
+    }
+
+
+def _array_element_type(field_type: str) -> Optional[str]:
+    """解析数组字段的元素类型，如 double[9] / sequence<uint8> / sequence<float, 10>"""
+    if field_type.startswith('sequence<') and field_type.endswith('>'):
+        return field_type[len('sequence<'):-1].split(',')[0].strip()
+    if field_type.endswith(']') and '[' in field_type:
+        return field_type[:field_type.index('[')]
+    return None
+
+
+# ---- 专用字段编码函数（在start()中按字段类型选定，签名均为 (data, msg)） ----
+
+def _encode_image(data, msg) -> str:
+    """sensor_msgs/Image 的图像数据"""
+    return _to_data_url(_DATA_URL_PREFIX_JPEG, _as_byte_view(data))
+
+
+def _encode_compressed_image(data, msg) -> str:
+    """sensor_msgs/CompressedImage 的图像数据，按format字段选择前缀"""
+    prefix = _DATA_URL_PREFIX_PNG if 'png' in msg.format.lower() else _DATA_URL_PREFIX_JPEG
+    return _to_data_url(prefix, _as_byte_view(data))
+
+
+def _encode_bytes(data, msg) -> str:
+    """单字节元素数组"""
+    return b64encode_as_string(_as_byte_view(data))
+
+
+def _encode_ndarray(data, msg):
+    """多字节数值数组（ndarray / array.array）转为列表，输出为JSON数组"""
+    return data.tolist()
+
+
+def _encode_scalar(data, msg):
+    """基本类型字段"""
+    return data
+
+
+def _encode_object(data, msg) -> Dict[str, Any]:
+    """嵌套的ROS2消息字段"""
+    return _message_to_dict(data)
+
+
+def _msgpack_default(obj):
+    """msgpack序列化无法直接处理的类型"""
+    if isinstance(obj, (np.ndarray, array.array)):
+        return obj.tolist()
+    return str(obj)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_message_class(message_type: str):
+    """解析并导入消息类型（所有桥接器共享缓存），例如: std_msgs/String"""
+    package_name, class_name = message_type.split('/')
+    module_name = f'{package_name}.msg'
+    # 已导入的模块直接从sys.modules获取，跳过完整的导入流程
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    return getattr(module, class_name)
 
 
 class TopicBridge:
     """通用话题桥接器"""
     
+    # 固定属性布局：减小实例内存占用并加快回调中的属性访问
+    __slots__ = (
+        # 基础组件与配置
+        'config', 'node', 'mqtt_interface', 'message_builder', 'logger',
+        'name', 'enabled', 'subscription', 'publisher', 'callback_group',
+        'ros_config', 'mqtt_config', 'metadata', '_message_class', '_dumps',
+        # 统计与计时
+        'message_count', 'start_time', '_start_ns', '_last_message_ns', '_last_publish_ns',
+        '_publish_interval_ns', '_last_message_dt', '_last_message_dt_ns',
+        # start()中缓存的运行期配置
+        '_ros_topic', '_message_type', '_is_image_bridge', '_is_compressed',
+        '_data_field', '_extract_header',
+        '_has_header_stamp', '_include_iso_time', '_multi_paths', '_field_accessor',
+        '_field_encoder', '_qos', '_retain', '_mqtt_topic', '_binary_passthrough',
+        '_encoding', '_source_node', '_frame_id', '_bridge_config_snapshot',
+        # MQTT到ROS方向
+        '_ros_msg_factory', '_target_field_type', '_payload_format',
+        # 批量发布与编码线程池
+        '_batch', '_batch_enabled', '_batch_interval', '_batch_timer',
+        '_encode_pool', '_encode_queue', '_encode_workers', '_encode_queue_size',
+    )
+    
     def __init__(self, 
                  bridge_config: Dict[str, Any], 
                  node: Node,
@@ -28,15 +213,35 @@ class TopicBridge:
         self.message_builder = message_builder
         self.logger = logger
         
+        # JSON序列化（输出bytes，发布时无需再次编码）
+        self._dumps = mqtt_interface.serialize
+        
         # 桥接状态
         self.name = bridge_config.get('name', 'unknown_bridge')
         self.enabled = bridge_config.get('enabled', True)
         self.subscription: Optional[Subscription] = None
+        # 每个桥接器独立的回调组：多线程执行器下各桥接器并行处理，
+        # 同一桥接器内的订阅与定时器回调仍串行执行
+        self.callback_group = MutuallyExclusiveCallbackGroup()
         self.message_count = 0
-        self.last_message_time = None
-        self.last_publish_time = None  # 新增：记录最后发布时间
         self.start_time = datetime.now()
         
+        # 热路径计时统一使用单调时钟（纳秒整数），墙钟时间仅在需要时换算
+        self._start_ns = time.monotonic_ns()
+        self._last_message_ns: Optional[int] = None
+        self._last_publish_ns: Optional[int] = None  # None表示尚未发布，首条消息不受间隔限制
+        self._publish_interval_ns = 0
+        self._last_message_dt: Optional[datetime] = None
+        self._last_message_dt_ns: Optional[int] = None
+        
+        # 批量发布：间隔内的消息先缓存，由定时器统一发布
+        self._batch: deque = deque()
+        self._batch_timer = None
+        
+        # 编码线程池：在执行器线程之外完成数据提取、编码与发布
+        self._encode_pool: Optional[ThreadPoolExecutor] = None
+        self._encode_queue: Optional[queue.Queue] = None
+        
         # 解析配置
         self.ros_config = bridge_config.get('ros_config', {})
         self.mqtt_config = bridge_config.get('mqtt_config', {})
@@ -62,7 +267,24 @@ class TopicBridge:
             ros_topic = self.ros_config.get('topic')
             queue_size = self.ros_config.get('queue_size', 10)
             
+            # 缓存运行期不变的配置，避免每条消息重复查询
+            self._cache_runtime_config()
+            
             if bridge_type == 'mqtt_to_ros':
+                # 预先解析目标字段类型，接收消息时直接构造并转换
+                sample = message_class()
+                if not hasattr(sample, self._data_field):
+                    self.logger.error(f'ROS消息类型没有字段: {self._data_field}')
+                    return False
+                self._target_field_type = type(getattr(sample, self._data_field))
+                self._ros_msg_factory = message_class
+                
+                # MQTT负载格式：raw（不解析）、json（始终尝试解析）、auto（先探测再解析）
+                self._payload_format = self.mqtt_config.get('payload_format', 'auto')
+                if self._payload_format not in ('raw', 'json', 'auto'):
+                    self.logger.warning(f'未知的负载格式: {self._payload_format}，使用auto')
+                    self._payload_format = 'auto'
+                
                 # 创建ROS发布者
                 self.publisher = self.node.create_publisher(
                     message_class,
@@ -70,7 +292,7 @@ class TopicBridge:
                     queue_size
                 )
                 # 先设置回调，再订阅
-                mqtt_topic = self._build_mqtt_topic()
+                mqtt_topic = self._mqtt_topic
                 self.mqtt_interface.set_on_message_callback(self._mqtt_message_callback)
                 success = self.mqtt_interface.subscribe(mqtt_topic)
                 if not success:
@@ -78,17 +300,45 @@ class TopicBridge:
                     return False
                 self.logger.info(f'已订阅MQTT主题: {mqtt_topic} -> ROS话题: {ros_topic}')
             else:
+                # 编码线程池（需先于订阅者创建）
+                if self._encode_workers > 0:
+                    self._encode_queue = queue.Queue(maxsize=self._encode_queue_size)
+                    self._encode_pool = ThreadPoolExecutor(
+                        max_workers=self._encode_workers,
+                        thread_name_prefix=f'{self.name}_encode'
+                    )
+                    # 常驻的编码循环，每条消息不再单独提交任务
+                    for _ in range(self._encode_workers):
+                        self._encode_pool.submit(self._encode_worker, self._encode_queue)
+                
+                # 传感器类高频话题可配置为BEST_EFFORT，避免可靠传输的重传与队列阻塞
+                reliability = (ReliabilityPolicy.BEST_EFFORT if self.ros_config.get('best_effort', False)
+                               else ReliabilityPolicy.RELIABLE)
+                qos = QoSProfile(
+                    reliability=reliability,
+                    history=HistoryPolicy.KEEP_LAST,
+                    depth=queue_size
+                )
+                
                 # 创建ROS订阅者
                 self.subscription = self.node.create_subscription(
                     message_class,
                     ros_topic,
                     self._message_callback,
-                    queue_size
+                    qos,
+                    callback_group=self.callback_group
                 )
+                # 批量发布定时器
+                if self._batch_enabled:
+                    self._batch_timer = self.node.create_timer(
+                        self._batch_interval,
+                        self._flush_batch,
+                        callback_group=self.callback_group
+                    )
             
             self.logger.info(f'✓ 桥接器 {self.name} 已启动')
             self.logger.info(f'  ROS话题: {ros_topic}')
-            self.logger.info(f'  消息类型: {self.ros_config.get("message_type")}')
+            self.logger.info(f'  消息类型: {self._message_type}')
             self.logger.info(f'  队列大小: {queue_size}')
             return True
             
@@ -102,16 +352,145 @@ class TopicBridge:
             self.node.destroy_subscription(self.subscription)
             self.subscription = None
         
+        if self._encode_pool:
+            # 丢弃尚未处理的消息，向每个编码线程发送停止标记，等待正在编码的消息完成
+            try:
+                while True:
+                    self._encode_queue.get_nowait()
+            except queue.Empty:
+                pass
+            for _ in range(self._encode_workers):
+                self._encode_queue.put(None)
+            self._encode_pool.shutdown(wait=True)
+            self._encode_pool = None
+            self._encode_queue = None
+        
+        if self._batch_timer:
+            self.node.destroy_timer(self._batch_timer)
+            self._batch_timer = None
+            # 发布剩余的缓存消息
+            self._flush_batch()
+        
         if hasattr(self, 'publisher'):
             self.node.destroy_publisher(self.publisher)
             delattr(self, 'publisher')
             
             # 取消订阅MQTT主题
-            mqtt_topic = self._build_mqtt_topic()
-            self.mqtt_interface.unsubscribe(mqtt_topic)
+            self.mqtt_interface.unsubscribe(self._mqtt_topic)
             
         self.logger.info(f'✓ 桥接器 {self.name} 已停止')
     
+    def _cache_runtime_config(self):
+        """解析并缓存start()之后不再变化的配置项"""
+        # ROS相关配置
+        self._ros_topic = self.ros_config.get('topic')
+        self._message_type = self.ros_config.get('message_type', '')
+        self._is_image_bridge = self._message_type in IMAGE_TYPES
+        self._is_compressed = self._message_type == 'sensor_msgs/CompressedImage'
+        self._data_field = self.ros_config.get('data_field', 'data')
+        self._extract_header = self.ros_config.get('extract_header_timestamp', False)
+        # header是否存在由消息类型决定，只需判断一次
+        self._has_header_stamp = 'header' in self._message_class.get_fields_and_field_types()
+        # 与 extract_header_timestamp 同在ros_config中配置
+        self._include_iso_time = self.ros_config.get('include_iso_time', False)
+        if self._extract_header and not self._has_header_stamp:
+            self.logger.warning(f'桥接器 {self.name} 的消息类型没有header字段，无法提取时间戳')
+        
+        # 预编译字段访问器（attrgetter原生支持点号嵌套路径）
+        if ',' in self._data_field:
+            # 多字段提取，如 "linear.x,angular.z"：预先构建 (字段名, 访问器) 路径表
+            # 字段名驻留，后续构建结果字典时复用同一字符串对象
+            self._multi_paths = tuple(
+                (name, operator.attrgetter(name))
+                for name in (sys.intern(field.strip()) for field in self._data_field.split(','))
+            )
+            self._field_accessor = None
+        else:
+            # 简单字段或单一嵌套字段，如 "data" / "pose.position.x"
+            self._multi_paths = None
+            self._field_accessor = operator.attrgetter(self._data_field)
+        
+        # 发送间隔（纳秒）
+        publish_interval = self.ros_config.get('publish_interval', None)
+        self._publish_interval_ns = int(publish_interval * 1e9) if publish_interval else 0
+        
+        # 批量发布：启用后间隔内的消息不再丢弃，而是合并为一条消息发布
+        self._batch_enabled = bool(publish_interval) and self.ros_config.get('batch_publish', False)
+        self._batch_interval = publish_interval
+        self._batch = deque(maxlen=self.ros_config.get('batch_max_size', 100))
+        if self._batch_enabled:
+            self._publish_interval_ns = 0
+        
+        # 编码线程数（0表示在ROS执行器线程内同步处理）与待编码队列长度
+        self._encode_workers = self.mqtt_config.get('encode_workers', 0)
+        self._encode_queue_size = self.mqtt_config.get('encode_queue_size', 4)
+        
+        # MQTT相关配置
+        self._qos = self.mqtt_config.get('qos', 1)
+        self._retain = self.mqtt_config.get('retain', False)
+        self._mqtt_topic = self._build_mqtt_topic()
+        # 二进制直通仅适用于图像桥接器的data字段
+        self._binary_passthrough = self.mqtt_config.get('binary_passthrough', False)
+        if self._binary_passthrough and not (self._is_image_bridge and self._data_field == 'data'):
+            self.logger.warning(f'桥接器 {self.name} 不是图像data字段，忽略binary_passthrough配置')
+            self._binary_passthrough = False
+        
+        # 消息编码：默认JSON，可选msgpack
+        self._encoding = self.mqtt_config.get('encoding', 'json')
+        if self._encoding == 'msgpack' and msgpack is None:
+            self.logger.warning(f'桥接器 {self.name} 配置了msgpack编码，但未安装msgpack，回退为JSON')
+            self._encoding = 'json'
+        if self._encoding == 'msgpack':
+            self._dumps = functools.partial(msgpack.packb, default=_msgpack_default)
+        else:
+            self._dumps = self.mqtt_interface.serialize
+        
+        # 元数据
+        self._source_node = self.metadata.get('source_node', 'unknown_node')
+        self._frame_id = self.metadata.get('frame_id', 'unknown_frame')
+        
+        # 附加到每条消息中的桥接配置（所有消息共享同一字典，序列化时只读）
+        self._bridge_config_snapshot = {
+            'ros_topic': self._ros_topic,
+            'message_type': self.ros_config.get('message_type'),
+            'data_field': self.ros_config.get('data_field')
+        }
+        
+        # 按消息类型与字段类型选择专用的字段编码函数
+        self._field_encoder = self._compile_field_encoder()
+    
+    def _compile_field_encoder(self) -> Callable[[Any, Any], Any]:
+        """根据消息类型与字段声明类型选择专用编码函数，无法确定时回退到通用处理"""
+        def generic(data, msg):
+            return self._process_field_data(data, self._data_field, msg=msg)
+        
+        # 多字段或嵌套字段路径使用通用处理
+        if self._multi_paths is not None or '.' in self._data_field:
+            return generic
+        
+        if self._is_image_bridge and self._data_field == 'data':
+            if self._is_compressed:
+                return _encode_compressed_image
+            return _encode_image
+        
+        field_type = self._message_class.get_fields_and_field_types().get(self._data_field)
+        if field_type is None:
+            return generic
+        
+        element_type = _array_element_type(field_type)
+        if element_type is not None:
+            if element_type in _BYTE_ELEMENT_TYPES:
+                return _encode_bytes
+            if element_type in _NUMERIC_ELEMENT_TYPES:
+                return _encode_ndarray
+            return generic
+        
+        if field_type in _SCALAR_FIELD_TYPES or field_type.startswith(('string<', 'wstring<')):
+            return _encode_scalar
+        if '/' in field_type:
+            return _encode_object
+        return generic
+    
     def _get_message_class(self):
         """动态获取消息类型"""
         if self._message_class:
@@ -129,12 +508,10 @@ class TopicBridge:
                 self.logger.error(f'无效的消息类型格式: {message_type}')
                 return None
             
-            package_name, class_name = parts
-            module_name = f'{package_name}.msg'
+            class_name = parts[1]
             
-            # 动态导入模块
-            module = importlib.import_module(module_name)
-            message_class = getattr(module, class_name)
+            # 动态导入模块（模块级缓存）
+            message_class = _resolve_message_class(message_type)
             
             self._message_class = message_class
             self.logger.debug(f'成功加载消息类型: {message_type}')
@@ -154,47 +531,98 @@ class TopicBridge:
         """ROS消息回调函数"""
         try:
             # 检查发送间隔限制
-            publish_interval = self.ros_config.get('publish_interval', None)
-            if publish_interval is not None:
-                current_time = datetime.now()
-                if self.last_publish_time is not None:
-                    elapsed = (current_time - self.last_publish_time).total_seconds()
-                    if elapsed < publish_interval:
-                        # 未达到发送间隔，跳过此消息
-                        self.logger.debug(f'桥接器 {self.name} 跳过消息 (间隔: {elapsed:.2f}s < {publish_interval}s)')
-                        return
+            now_ns = time.monotonic_ns()
+            if (self._publish_interval_ns and self._last_publish_ns is not None
+                    and now_ns - self._last_publish_ns < self._publish_interval_ns):
+                # 未达到发送间隔，跳过此消息
+                return
+            self._last_publish_ns = now_ns
             
             # 更新统计信息
             self.message_count += 1
-            self.last_message_time = datetime.now()
-            self.last_publish_time = datetime.now()  # 记录发布时间
+            self._last_message_ns = now_ns
             
             # 提取ROS header时间戳（如果配置启用）
             header_timestamp = None
-            if self.ros_config.get('extract_header_timestamp', False):
+            if self._extract_header:
                 header_timestamp = self._extract_header_timestamp(msg)
             
-            # 提取数据
-            data = self._extract_message_data(msg)
-            if data is None:
-                self.logger.warning(f'桥接器 {self.name} 无法提取消息数据')
+            if self._encode_pool is not None:
+                # 耗时的提取、编码与发布交由线程池处理
+                self._submit_encode(msg, header_timestamp, self.message_count)
+            else:
+                self._encode_and_publish(msg, header_timestamp, self.message_count)
+                
+        except Exception as e:
+            self.logger.error(f'桥接器 {self.name} 处理消息时发生错误: {str(e)}')
+    
+    def _submit_encode(self, msg, header_timestamp: Optional[Dict[str, Any]], message_id: int):
+        """将消息放入待编码队列，队列已满时丢弃最旧的消息"""
+        item = (msg, header_timestamp, message_id)
+        try:
+            self._encode_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                dropped = self._encode_queue.get_nowait()
+            except queue.Empty:
+                dropped = item
+            if dropped is None:
+                # 取到的是停止标记（桥接器正在停止），放回标记并丢弃新消息
+                self._encode_queue.put_nowait(None)
+                return
+            self.logger.debug(f'桥接器 {self.name} 编码队列已满，丢弃最旧的消息')
+            try:
+                self._encode_queue.put_nowait(item)
+            except queue.Full:
+                pass
+    
+    def _encode_worker(self, encode_queue: queue.Queue):
+        """编码线程主循环：阻塞等待待编码消息，收到停止标记（None）后退出"""
+        while True:
+            item = encode_queue.get()
+            if item is None:
                 return
+            self._encode_and_publish(*item)
+    
+    def _encode_and_publish(self, msg, header_timestamp: Optional[Dict[str, Any]], message_id: int):
+        """提取消息数据，编码并发布到MQTT"""
+        try:
+            mqtt_topic = self._mqtt_topic
+            
+            # 二进制直通：原始字节发布到子主题，JSON中仅保留元数据
+            binary_data = self._extract_binary_field(msg) if self._binary_passthrough else None
+            if binary_data is not None:
+                binary_topic = f'{mqtt_topic}/image'
+                if not self.mqtt_interface.publish(binary_topic, binary_data, qos=self._qos, retain=False):
+                    self.logger.error(f'✗ 桥接器 {self.name} 二进制数据发布失败')
+                    return
+                data = {
+                    'binary_topic': binary_topic,
+                    'size': len(binary_data)
+                }
+                if hasattr(msg, 'format'):
+                    data['format'] = msg.format
+            else:
+                # 提取数据
+                data = self._extract_message_data(msg)
+                if data is None:
+                    self.logger.warning(f'桥接器 {self.name} 无法提取消息数据')
+                    return
             
             # 构建MQTT消息（传入header时间戳）
-            mqtt_message = self._build_mqtt_message(data, header_timestamp=header_timestamp)
+            mqtt_message = self._build_mqtt_message(data, header_timestamp=header_timestamp, message_id=message_id)
             
-            # 构建MQTT主题
-            mqtt_topic = self._build_mqtt_topic()
+            # 批量模式：加入缓存，由定时器统一发布（超出上限时丢弃最旧的消息）
+            if self._batch_enabled:
+                self._batch.append(mqtt_message)
+                return
             
             # 发布到MQTT
-            qos = self.mqtt_config.get('qos', 1)
-            retain = self.mqtt_config.get('retain', False)
-            
             success = self.mqtt_interface.publish(
                 mqtt_topic,
-                mqtt_message,
-                qos=qos,
-                retain=retain
+                self._dumps(mqtt_message),
+                qos=self._qos,
+                retain=self._retain
             )
             
             if success:
@@ -205,148 +633,121 @@ class TopicBridge:
                 self.logger.error(f'✗ 桥接器 {self.name} MQTT发布失败')
                 
         except Exception as e:
-            self.logger.error(f'桥接器 {self.name} 处理消息时发生错误: {str(e)}')
+            self.logger.error(f'桥接器 {self.name} 编码发布消息时发生错误: {str(e)}')
     
-    def _extract_header_timestamp(self, msg) -> Optional[Dict[str, Any]]:
-        """提取ROS header时间戳"""
+    def _flush_batch(self):
+        """将缓存的消息合并为一条MQTT消息发布"""
+        if not self._batch:
+            return
+        
         try:
-            if hasattr(msg, 'header'):
-                header = msg.header
-                if hasattr(header, 'stamp'):
-                    stamp = header.stamp
-                    # 提取秒和纳秒
-                    seconds = stamp.sec if hasattr(stamp, 'sec') else 0
-                    nanoseconds = stamp.nanosec if hasattr(stamp, 'nanosec') else 0
-                    
-                    # 转换为总秒数（浮点）
-                    timestamp_sec = seconds + nanoseconds * 1e-9
-                    
-                    # 同时提供ISO格式的时间戳（用于人类可读）
-                    from datetime import datetime, timezone
-                    dt = datetime.fromtimestamp(timestamp_sec, tz=timezone.utc)
-                    
-                    self.logger.debug(f'提取到header时间戳: {timestamp_sec}秒 ({dt.isoformat()})')
-                    
-                    return {
-                        'secs': seconds,
-                        'nsecs': nanoseconds,
-                        'timestamp': timestamp_sec,
-                        'iso_time': dt.isoformat()
-                    }
-                else:
-                    self.logger.debug('header中没有stamp字段')
+            # 逐条popleft取出：编码线程可能同时append，list()+clear()会丢失其间加入的消息
+            batch = []
+            for _ in range(len(self._batch)):
+                batch.append(self._batch.popleft())
+            
+            success = self.mqtt_interface.publish(
+                self._mqtt_topic,
+                self._dumps({'batch': batch}),
+                qos=self._qos,
+                retain=self._retain
+            )
+            
+            if success:
+                self.logger.debug(f'✓ 桥接器 {self.name} 批量发布 {len(batch)} 条消息')
             else:
-                self.logger.debug('消息中没有header字段')
+                self.logger.error(f'✗ 桥接器 {self.name} 批量发布失败')
+                
+        except Exception as e:
+            self.logger.error(f'桥接器 {self.name} 批量发布时发生错误: {str(e)}')
+    
+    def _extract_header_timestamp(self, msg) -> Optional[Dict[str, Any]]:
+        """提取ROS header时间戳"""
+        if not self._has_header_stamp:
             return None
+        
+        try:
+            stamp = msg.header.stamp
+            seconds = stamp.sec
+            nanoseconds = stamp.nanosec
+            
+            header_timestamp = {
+                'secs': seconds,
+                'nsecs': nanoseconds,
+                # 转换为总秒数（浮点）
+                'timestamp': seconds + nanoseconds * 1e-9
+            }
+            
+            # ISO格式的时间戳仅用于人类可读，按配置启用
+            if self._include_iso_time:
+                dt = datetime.fromtimestamp(header_timestamp['timestamp'], tz=timezone.utc)
+                header_timestamp['iso_time'] = dt.isoformat()
+            
+            return header_timestamp
         except Exception as e:
             self.logger.error(f'提取header时间戳时发生错误: {str(e)}')
             return None
     
     def _extract_message_data(self, msg) -> Any:
-        """提取消息数据（修改此处以传递msg到_process_field_data）"""
+        """提取消息数据（传递msg到_process_field_data以获取图像格式）"""
         try:
-            data_field = self.ros_config.get('data_field', 'data')
-            
-            # 首先检查多字段提取（优先级更高）
-            if ',' in data_field:
-                # 多字段提取，如 "linear.x,angular.z"
-                fields = [field.strip() for field in data_field.split(',')]
-                result = {}
-                for field in fields:
-                    if '.' in field:
-                        # 嵌套访问
-                        obj = msg
-                        for field_part in field.split('.'):
-                            if hasattr(obj, field_part):
-                                obj = getattr(obj, field_part)
-                            else:
-                                self.logger.error(f'消息中找不到字段: {field_part}')
-                                return None
-                        # 处理字段数据时传入原始msg，用于获取图像格式
-                        result[field] = self._process_field_data(obj, field, msg=msg)
-                    else:
-                        # 简单字段
-                        if hasattr(msg, field):
-                            field_data = getattr(msg, field)
-                            # 处理字段数据时传入原始msg，用于获取图像格式
-                            result[field] = self._process_field_data(field_data, field, msg=msg)
-                        else:
-                            self.logger.error(f'消息中找不到字段: {field}')
-                            return None
-                return result
-            elif '.' in data_field:
-                # 单一嵌套字段访问，如 "pose.position.x"
-                obj = msg
-                for field_part in data_field.split('.'):
-                    if hasattr(obj, field_part):
-                        obj = getattr(obj, field_part)
-                    else:
-                        self.logger.error(f'消息中找不到字段: {field_part}')
-                        return None
-                # 处理字段数据时传入原始msg，用于获取图像格式
-                return self._process_field_data(obj, data_field, msg=msg)
-            else:
-                # 简单字段访问
-                if hasattr(msg, data_field):
-                    field_data = getattr(msg, data_field)
-                    # 处理字段数据时传入原始msg，用于获取图像格式
-                    return self._process_field_data(field_data, data_field, msg=msg)
-                else:
-                    self.logger.error(f'消息中找不到字段: {data_field}')
-                    return None
-                    
+            if self._multi_paths is not None:
+                # 多字段提取，逐个字段处理
+                return {
+                    name: self._process_field_data(getter(msg), name, msg=msg)
+                    for name, getter in self._multi_paths
+                }
+            return self._field_encoder(self._field_accessor(msg), msg)
+        
+        except AttributeError as e:
+            self.logger.error(f'消息中找不到字段: {str(e)}')
+            return None
         except Exception as e:
             self.logger.error(f'提取消息数据时发生错误: {str(e)}')
             return None
     
+    def _extract_binary_field(self, msg) -> Optional[bytes]:
+        """提取图像的原始二进制数据（二进制直通模式），非二进制数据返回None"""
+        try:
+            obj = self._field_accessor(msg)
+        except AttributeError:
+            return None
+        
+        if isinstance(obj, bytes):
+            return obj
+        elif isinstance(obj, (np.ndarray, array.array)):
+            return obj.tobytes()
+        return None
+    
     def _process_field_data(self, data, field_name: str, msg=None) -> Any:
         """处理字段数据，对二进制数据进行Base64编码并添加图像前缀"""
         try:
-            # 获取消息类型信息
-            message_type = self.ros_config.get('message_type', '')
-            
-            # 检查是否是图像相关的数据字段
-            is_image_data = (
-                field_name == 'data' and 
-                message_type in ['sensor_msgs/Image', 'sensor_msgs/CompressedImage']
-            )
-            
-            # 如果是图像数据，进行特殊处理
-            if is_image_data:
-                self.logger.debug(f'检测到图像数据字段: {field_name}, 消息类型: {message_type}, 数据类型: {type(data)}')
-                
-                # 确定图像格式（jpeg/png）
-                format_prefix = 'jpeg'  # 默认值
-                if message_type == 'sensor_msgs/CompressedImage' and msg:
-                    # 从CompressedImage消息的format字段提取格式
-                    img_format = getattr(msg, 'format', '').lower()
-                    if 'png' in img_format:
-                        format_prefix = 'png'
-                    elif 'jpeg' in img_format or 'jpg' in img_format:
-                        format_prefix = 'jpeg'
-                
-                # 处理不同类型的数据（新增对 array.array 的支持）
-                if isinstance(data, bytes):
-                    byte_data = data
-                elif isinstance(data, np.ndarray):
-                    byte_data = data.tobytes()
-                elif isinstance(data, array.array):  # 处理 array.array 类型
-                    byte_data = data.tobytes()  # 转换为 bytes
-                else:
+            # 如果是图像相关的数据字段，进行特殊处理
+            if self._is_image_bridge and field_name == 'data':
+                if not isinstance(data, (bytes, np.ndarray, array.array)):
                     self.logger.warning(f'未知的图像数据类型: {type(data)}')
                     return str(data)
                 
-                # 编码为Base64并添加前缀
-                base64_str = base64.b64encode(byte_data).decode('utf-8')
-                return f"data:image/{format_prefix};base64,{base64_str}"
+                # 与编译后的字段编码器共用同一套图像编码逻辑（仅CompressedImage需要读取format字段）
+                if self._is_compressed and msg is not None:
+                    return _encode_compressed_image(data, msg)
+                return _encode_image(data, msg)
             
-            # 非图像数据的处理逻辑（保持不变，可同样添加 array.array 支持）
+            # 非图像数据：bytes与字节数组（经memoryview零拷贝）编码为Base64，数值数组转为列表，
+            # ROS消息单次遍历转为字典，其他可迭代对象逐项处理
             if isinstance(data, bytes):
-                return base64.b64encode(data).decode('utf-8')
+                return b64encode_as_string(data)
             elif isinstance(data, np.ndarray):
-                return base64.b64encode(data.tobytes()).decode('utf-8')
-            elif isinstance(data, array.array):  # 非图像的 array 类型也转换为Base64
-                return base64.b64encode(data.tobytes()).decode('utf-8')
+                # 数值数组转为列表输出为JSON数组，字节数组仍编码为Base64
+                if data.itemsize > 1:
+                    return data.tolist()
+                return b64encode_as_string(_as_byte_view(data))
+            elif isinstance(data, array.array):
+                if data.itemsize > 1:
+                    return data.tolist()
+                return b64encode_as_string(_as_byte_view(data))
+            elif hasattr(data, 'get_fields_and_field_types'):
+                return _message_to_dict(data)
             elif hasattr(data, '__dict__'):
                 return self._object_to_dict(data)
             elif hasattr(data, '__iter__') and not isinstance(data, (str, dict)):
@@ -357,8 +758,9 @@ class TopicBridge:
         except Exception as e:
             self.logger.error(f'处理字段数据时发生错误: {str(e)}')
             return None
+    
     def _object_to_dict(self, obj) -> Dict[str, Any]:
-        """将ROS消息对象转换为字典"""
+        """将普通对象转换为字典（ROS2消息交由_message_to_dict处理）"""
         try:
             if obj is None:
                 return None
@@ -368,30 +770,7 @@ class TopicBridge:
             # 获取对象的所有字段
             if hasattr(obj, 'get_fields_and_field_types'):
                 # ROS2消息对象
-                fields = obj.get_fields_and_field_types()
-                for field_name in fields.keys():
-                    if hasattr(obj, field_name):
-                        field_value = getattr(obj, field_name)
-                        
-                        # 递归处理嵌套对象
-                        if hasattr(field_value, '__dict__') and hasattr(field_value, 'get_fields_and_field_types'):
-                            result[field_name] = self._object_to_dict(field_value)
-                        elif isinstance(field_value, (list, tuple)):
-                            result[field_name] = [
-                                self._object_to_dict(item) if (hasattr(item, '__dict__') and hasattr(item, 'get_fields_and_field_types')) else item
-                                for item in field_value
-                            ]
-                        elif isinstance(field_value, (bytes, np.ndarray, array.array)):
-                            # 二进制数据转为base64
-                            if isinstance(field_value, bytes):
-                                result[field_name] = base64.b64encode(field_value).decode('utf-8')
-                            elif isinstance(field_value, np.ndarray):
-                                result[field_name] = base64.b64encode(field_value.tobytes()).decode('utf-8')
-                            elif isinstance(field_value, array.array):
-                                result[field_name] = base64.b64encode(field_value.tobytes()).decode('utf-8')
-                        else:
-                            # 基本类型直接赋值
-                            result[field_name] = field_value
+                return _message_to_dict(obj)
             else:
                 # 普通对象（非ROS2消息）
                 for key, value in obj.__dict__.items():
@@ -413,32 +792,29 @@ class TopicBridge:
             return str(obj)
 
     
-    def _build_mqtt_message(self, data, header_timestamp: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _build_mqtt_message(self, data, header_timestamp: Optional[Dict[str, Any]] = None,
+                            message_id: Optional[int] = None) -> Dict[str, Any]:
         """构建MQTT消息"""
         try:
-            # 获取元数据
-            source_node = self.metadata.get('source_node', 'unknown_node')
-            frame_id = self.metadata.get('frame_id', 'unknown_frame')
+            # 异步编码时使用接收消息时记录的序号
+            if message_id is None:
+                message_id = self.message_count
             
             # 使用消息构建器
             mqtt_message = self.message_builder.create_ros_message(
-                source_node=source_node,
-                source_topic=self.ros_config.get('topic'),
+                source_node=self._source_node,
+                source_topic=self._ros_topic,
                 data=data,
-                message_id=self.message_count,
-                frame_id=frame_id
+                message_id=message_id,
+                frame_id=self._frame_id
             )
             
             # 添加桥接器特定的元数据
             mqtt_message.update({
                 'bridge_name': self.name,
-                'bridge_message_count': self.message_count,
-                'bridge_uptime_seconds': (datetime.now() - self.start_time).total_seconds(),
-                'bridge_config': {
-                    'ros_topic': self.ros_config.get('topic'),
-                    'message_type': self.ros_config.get('message_type'),
-                    'data_field': self.ros_config.get('data_field')
-                }
+                'bridge_message_count': message_id,
+                'bridge_uptime_seconds': (time.monotonic_ns() - self._start_ns) * 1e-9,
+                'bridge_config': self._bridge_config_snapshot
             })
             
             # 添加ROS header时间戳（如果存在）
@@ -465,16 +841,38 @@ class TopicBridge:
             self.logger.error(f'构建MQTT主题时发生错误: {str(e)}')
             return 'ros2/unknown/data'
     
+    @property
+    def last_message_time(self) -> Optional[datetime]:
+        """最后一条消息的墙钟时间（由单调时钟按需换算并缓存）"""
+        if self._last_message_ns is None:
+            return None
+        if self._last_message_dt_ns != self._last_message_ns:
+            elapsed_ns = time.monotonic_ns() - self._last_message_ns
+            self._last_message_dt = datetime.now() - timedelta(microseconds=elapsed_ns // 1000)
+            self._last_message_dt_ns = self._last_message_ns
+        return self._last_message_dt
+    
+    def reset_statistics(self):
+        """重置统计信息"""
+        self.message_count = 0
+        self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        self._last_message_ns = None
+        self._last_publish_ns = None
+        self._last_message_dt = None
+        self._last_message_dt_ns = None
+    
     def get_statistics(self) -> Dict[str, Any]:
         """获取桥接器统计信息"""
-        uptime = (datetime.now() - self.start_time).total_seconds()
+        uptime = (time.monotonic_ns() - self._start_ns) * 1e-9
+        last_message_time = self.last_message_time
         
         return {
             'bridge_name': self.name,
             'enabled': self.enabled,
             'message_count': self.message_count,
             'uptime_seconds': uptime,
-            'last_message_time': self.last_message_time.isoformat() if self.last_message_time else None,
+            'last_message_time': last_message_time.isoformat() if last_message_time else None,
             'message_rate': self.message_count / uptime if uptime > 0 else 0.0,
             'ros_config': self.ros_config,
             'mqtt_config': self.mqtt_config,
@@ -483,60 +881,62 @@ class TopicBridge:
     
     def is_active(self, timeout_seconds: float = 10.0) -> bool:
         """检查桥接器是否活跃"""
-        if not self.last_message_time:
+        if self._last_message_ns is None:
             return False
         
-        elapsed = (datetime.now() - self.last_message_time).total_seconds()
-        return elapsed < timeout_seconds
+        return time.monotonic_ns() - self._last_message_ns < int(timeout_seconds * 1e9)
+    
+    def _decode_mqtt_payload(self, payload: bytes) -> Any:
+        """按配置的负载格式解析MQTT消息"""
+        if self._payload_format == 'raw':
+            return payload.decode('utf-8')
+        
+        if self._encoding == 'msgpack':
+            # auto模式下先探测首字节，纯文本负载（如 "1"、"on"）不交给msgpack解析，
+            # 否则短ASCII文本会被误解析为msgpack整数
+            if self._payload_format == 'auto' and payload[:1] and payload[0] in _TEXT_START_BYTES:
+                return payload.decode('utf-8')
+            parse = msgpack.unpackb
+        else:
+            # auto模式下先探测首个非空白字节，明显不是JSON时直接按字符串处理，避免解析异常的开销
+            if self._payload_format == 'auto' and payload.lstrip()[:1] not in _JSON_START_BYTES:
+                return payload.decode('utf-8')
+            parse = json_loads
+        
+        try:
+            mqtt_message = parse(payload)
+        except ValueError:
+            # 如果不是JSON/msgpack格式，尝试直接解码为字符串
+            return payload.decode('utf-8')
+        
+        # 如果消息是简单类型（如布尔值），直接使用
+        if isinstance(mqtt_message, (bool, int, float, str)):
+            return mqtt_message
+        # 否则尝试获取数据字段
+        return mqtt_message.get('data', mqtt_message)
     
     def _mqtt_message_callback(self, topic: str, payload: bytes):
         """处理从MQTT接收到的消息"""
         try:
             # 更新统计信息
             self.message_count += 1
-            self.last_message_time = datetime.now()
+            self._last_message_ns = time.monotonic_ns()
             
             # 解析MQTT消息
-            try:
-                mqtt_message = json.loads(payload.decode('utf-8'))
-                # 如果消息是简单类型（如布尔值），直接使用
-                if isinstance(mqtt_message, (bool, int, float, str)):
-                    data = mqtt_message
-                else:
-                    # 否则尝试获取数据字段
-                    data = mqtt_message.get('data', mqtt_message)
-            except json.JSONDecodeError:
-                # 如果不是JSON格式，尝试直接解码为字符串
-                data = payload.decode('utf-8')
-            
-            # 创建ROS消息
-            message_class = self._get_message_class()
-            if not message_class:
-                return
-            
-            ros_msg = message_class()
+            data = self._decode_mqtt_payload(payload)
             
-            # 获取目标字段名
-            data_field = self.ros_config.get('data_field', 'data')
-            
-            # 设置消息字段
-            if hasattr(ros_msg, data_field):
-                field_type = type(getattr(ros_msg, data_field))
-                # 转换数据类型以匹配目标字段
-                try:
-                    converted_data = field_type(data)
-                    setattr(ros_msg, data_field, converted_data)
-                except (ValueError, TypeError) as e:
-                    self.logger.error(f'数据类型转换失败: {str(e)}')
-                    return
-            else:
-                self.logger.error(f'ROS消息类型没有字段: {data_field}')
+            # 创建ROS消息并设置字段（目标字段类型已在start()中解析）
+            ros_msg = self._ros_msg_factory()
+            try:
+                setattr(ros_msg, self._data_field, self._target_field_type(data))
+            except (ValueError, TypeError) as e:
+                self.logger.error(f'数据类型转换失败: {str(e)}')
                 return
             
             # 发布到ROS话题
             if hasattr(self, 'publisher'):
                 self.publisher.publish(ros_msg)
-                self.logger.debug(f'✓ 已发布到ROS话题: {self.ros_config.get("topic")}')
+                self.logger.debug(f'✓ 已发布到ROS话题: {self._ros_topic}')
             else:
                 self.logger.error('未找到ROS发布者')
                 
@@ -18,6 +18,10 @@ setup(
         ]),
     ],
     install_requires=['setuptools', 'paho-mqtt', 'pyyaml'],
+    extras_require={
+        # 可选加速依赖：未安装时回退到标准库json/base64，msgpack编码不可用
+        'fast': ['orjson', 'pybase64', 'msgpack'],
+    },
     zip_safe=True,
     maintainer='Nolen Hsu',
     maintainer_email='26091004662@qq.com',